@@ -1,12 +1,16 @@
-import json
+import asyncio
+import inspect
 import os
-import pprint as pp
+import re
 import sys
-from collections.abc import Awaitable
-from dataclasses import dataclass
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable
+from dataclasses import dataclass, field
 from typing import Any, Callable
 
+import numpy as np
 from litellm import acompletion
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 
 from holo_chan.io.interfaces import OutputSink
 
@@ -20,8 +24,14 @@ TEMPERATURE = 0.7
 MAX_TOKENS = 1024
 
 MAX_TURNS = 10
+MAX_CONCURRENT_COMPLETIONS = 4
 TOOL_CALL_TAG = "tool_calls"
 
+# Semantic response cache (enabled with HOLO_SEMCACHE=1)
+SEMANTIC_CACHE_MODEL = "BAAI/bge-small-en-v1.5"
+SEMANTIC_CACHE_SIZE = 64
+SEMANTIC_CACHE_THRESHOLD = 0.97
+
 SYSTEM_PROMPT = """You are Hatsune Miku, an anime girl and a hologram. You have access to some external tools.
 When you need to use a tool, respond **only** with a JSON object that follows this schema:
 
@@ -64,6 +74,10 @@ def tool_backflip() -> str | None:
 class Tool:
     func: Callable[..., str | None]
     description: str
+    arity: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.arity = len(inspect.signature(self.func).parameters)
 
 
 TOOLS: dict[str, Tool] = {
@@ -83,10 +97,17 @@ TOOLS: dict[str, Tool] = {
 }
 
 
+# One "- name: description" line per tool; far fewer tokens than a JSON dump.
+_TOOLS_DOC = "\n".join(
+    f"- {name}: {tool.description}" for name, tool in sorted(TOOLS.items())
+)
+
+# Built once and kept byte-identical across turns so the provider's prompt-prefix
+# cache can reuse it. Tools are listed in sorted order for a stable layout.
 FULL_SYSTEM_PROMPT = (
     SYSTEM_PROMPT
     + "\n"
-    + pp.pformat({k: v for k, v in TOOLS.items()})
+    + _TOOLS_DOC
     + "\n"
     + SYSTEM_PROMPT_AFTER_TOOL_CALLS
 )
@@ -95,25 +116,78 @@ FULL_SYSTEM_PROMPT = (
 # 🧩  Helper utilities
 
 
+class _ToolCall(BaseModel):
+    name: str
+    arguments: dict[str, Any] = Field(default_factory=dict)
+
+
+class _ToolEnvelope(BaseModel):
+    tool_calls: _ToolCall
+
+
+# Parses and validates the tool-call schema in one pass (see SYSTEM_PROMPT).
+_TOOL_ADAPTER = TypeAdapter(_ToolEnvelope)
+
+
 def build_message(role: str, content: str) -> dict[str, str]:
     return {"role": role, "content": content}
 
 
+# Shared system message; copy it when starting a history that may be mutated.
+SYSTEM_MESSAGE = build_message("system", FULL_SYSTEM_PROMPT)
+_RESULT_TMPL = "Result of `{name}`: {result}"
+
+
+SENTENCE_BOUNDARY_RE = re.compile(r"[.!?,;:]")
+
+
+def split_complete_sentences(text: str, start: int = 0) -> tuple[list[str], str]:
+    """Split `text` into complete sentences and the unterminated remainder.
+
+    `text[:start]` must hold no boundary; the scan resumes from there.
+    """
+    sentences: list[str] = []
+    last = 0
+    for match in SENTENCE_BOUNDARY_RE.finditer(text, start):
+        segment = text[last : match.start()].strip()
+        delimiter = match.group()
+        sentences.append(f"{segment}{delimiter}" if segment else delimiter)
+        last = match.end()
+    return sentences, text[last:].strip()
+
+
+# Spoken replies only break where a delimiter run is followed by whitespace, so
+# "3.5", "3:30" and "example.com" stay whole and "..." stays with its sentence.
+# A delimiter at the very end waits for the next delta to decide.
+_SPOKEN_BOUNDARY_RE = re.compile(r"[.!?,;:]+(?=\s)")
+_DELIMITERS = ".!?,;:"
+
+
+def _split_spoken_sentences(text: str, start: int = 0) -> tuple[list[str], str]:
+    """Like `split_complete_sentences`, but for text that is about to be spoken."""
+    sentences: list[str] = []
+    last = 0
+    for match in _SPOKEN_BOUNDARY_RE.finditer(text, start):
+        segment = text[last : match.start()].strip()
+        delimiter = match.group()
+        if segment:
+            sentences.append(f"{segment}{delimiter}")
+        elif sentences:
+            # Fold stray punctuation into the sentence it belongs to.
+            sentences[-1] += delimiter
+        last = match.end()
+    return sentences, text[last:].strip()
+
+
 def parse_tool_call(message: str) -> tuple[str, dict[str, Any]] | None:
+    # Plain-text replies are the common case; reject them without parsing.
+    if not message.lstrip().startswith("{") or TOOL_CALL_TAG not in message:
+        return None
     try:
-        payload = json.loads(message)
-        if isinstance(payload, dict) and TOOL_CALL_TAG in payload:
-            call = payload[TOOL_CALL_TAG]
-            name = call["name"]
-            args = call.get("arguments", {})
-            if not isinstance(args, dict):
-                raise ValueError("`arguments` must be a JSON object")
-            return name, args
-    except json.JSONDecodeError:
-        pass
-    except Exception:
-        pass
-    return None
+        envelope = _TOOL_ADAPTER.validate_json(message)
+    except ValidationError:
+        return None
+    return envelope.tool_calls.name, envelope.tool_calls.arguments
 
 
 def call_tool(name: str, args: dict[str, Any]) -> str | None:
@@ -121,6 +195,8 @@ def call_tool(name: str, args: dict[str, Any]) -> str | None:
     if tool is None:
         return f"Error: unknown tool '{name}'."
     try:
+        if tool.arity == 0 and not args:
+            return tool.func()
         return tool.func(**args)
     except TypeError as exc:
         return f"Error: wrong arguments for tool '{name}': {exc}"
@@ -128,21 +204,158 @@ def call_tool(name: str, args: dict[str, Any]) -> str | None:
         return f"Error while executing tool '{name}': {exc}"
 
 
+# ----------------------------------------------------------------------
+# ♻️  Semantic response cache
+
+# user query -> (normalized embedding, assistant message), oldest first
+_SEMANTIC_CACHE: OrderedDict[str, tuple[np.ndarray, str]] = OrderedDict()
+_embedder: Any = None
+
+
+def _semantic_cache_enabled() -> bool:
+    return os.getenv("HOLO_SEMCACHE", "").strip().lower() in ("1", "true", "yes", "y", "on")
+
+
+def _embed_query(text: str) -> np.ndarray:
+    global _embedder
+    if _embedder is None:
+        try:
+            from fastembed import TextEmbedding  # pyright: ignore[reportMissingImports]
+        except ModuleNotFoundError as exc:
+            raise ModuleNotFoundError(
+                "HOLO_SEMCACHE requires fastembed. Install the `semcache` extra."
+            ) from exc
+        _embedder = TextEmbedding(SEMANTIC_CACHE_MODEL)
+    vector = np.asarray(next(iter(_embedder.embed([text]))), dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def _semantic_cache_text(messages: list[dict[str, str]], user_query: str) -> str:
+    # Short follow-ups ("yes", "do it again") only mean something next to the
+    # reply they answer, so embed the user turn together with that reply.
+    for message in reversed(messages):
+        if message["role"] == "assistant":
+            return f"{message['content']}\n{user_query}"
+    return user_query
+
+
+def _semantic_cache_lookup(embedding: np.ndarray) -> str | None:
+    if not _SEMANTIC_CACHE:
+        return None
+    keys = list(_SEMANTIC_CACHE)
+    matrix = np.stack([cached for cached, _ in _SEMANTIC_CACHE.values()])
+    scores = matrix @ embedding
+    best = int(np.argmax(scores))
+    if scores[best] < SEMANTIC_CACHE_THRESHOLD:
+        return None
+    _SEMANTIC_CACHE.move_to_end(keys[best])
+    return _SEMANTIC_CACHE[keys[best]][1]
+
+
+def _semantic_cache_store(query: str, embedding: np.ndarray, response: str) -> None:
+    _SEMANTIC_CACHE[query] = (embedding, response)
+    _SEMANTIC_CACHE.move_to_end(query)
+    while len(_SEMANTIC_CACHE) > SEMANTIC_CACHE_SIZE:
+        _SEMANTIC_CACHE.popitem(last=False)
+
+
 # ----------------------------------------------------------------------
 # 🤖  Core agent loop (async)
 
+# Caps in-flight LLM requests when several agent runs overlap.
+_LLM_SEM = asyncio.Semaphore(MAX_CONCURRENT_COMPLETIONS)
 
-async def _ai_completion(messages: list[dict[str, str]]) -> str:
+
+async def _ai_completion_stream(
+    messages: list[dict[str, str]],
+) -> AsyncIterator[str]:
     model = os.getenv("LLM_MODEL", DEFAULT_LLM_MODEL)
-    response = await acompletion(
-        model=model,
-        messages=messages,
-        temperature=TEMPERATURE,
-        max_tokens=MAX_TOKENS,
-        stream=False,
-    )
+    async with _LLM_SEM:
+        response = await acompletion(
+            model=model,
+            messages=messages,
+            temperature=TEMPERATURE,
+            max_tokens=MAX_TOKENS,
+            stream=True,
+        )
+
+        async for chunk in response:  # type: ignore
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
 
-    return response.choices[0].message.content  # type: ignore
+
+class _StreamInterrupted(Exception):
+    """The completion stream failed after part of a spoken reply arrived."""
+
+    def __init__(self, partial: str) -> None:
+        super().__init__(partial)
+        self.partial = partial
+
+
+async def _stream_and_speak(
+    messages: list[dict[str, str]], speak_out: OutputSink
+) -> tuple[str, asyncio.Task[None] | None]:
+    """Stream a completion, speaking complete sentences as they arrive.
+
+    Returns the full reply and the task still speaking it, or None if nothing
+    is being spoken. Replies that start like a JSON tool call are held back so
+    the caller can parse them once complete. Awaiting the task raises any
+    output sink error, separately from completion errors.
+    """
+    sentences: asyncio.Queue[str | None] = asyncio.Queue()
+
+    async def _speak_in_order() -> None:
+        while (sentence := await sentences.get()) is not None:
+            await speak_out.speak(sentence)
+
+    text = ""
+    buffer = ""
+    holding = False
+    speaker: asyncio.Task[None] | None = None
+    try:
+        async for delta in _ai_completion_stream(messages):
+            text += delta
+            if holding:
+                continue
+            if speaker is None:
+                head = text.lstrip()
+                if not head:
+                    continue
+                if head.startswith("{"):
+                    holding = True
+                    continue
+                print("🗣️  Speaking response")
+                speaker = asyncio.create_task(_speak_in_order())
+                buffer = head
+                scan_from = 0
+            else:
+                # The carried-over remainder has no boundary, except perhaps its
+                # trailing delimiters; only rescan from there.
+                scan_from = len(buffer.rstrip(_DELIMITERS))
+                buffer += delta
+            complete, remainder = _split_spoken_sentences(buffer, scan_from)
+            if complete:
+                for sentence in complete:
+                    sentences.put_nowait(sentence)
+                # Keep a trailing space so the next delta doesn't glue onto a word.
+                if remainder and buffer[-1].isspace():
+                    remainder += " "
+                buffer = remainder
+    except BaseException as exc:
+        if speaker is None:
+            raise
+        speaker.cancel()
+        if isinstance(exc, Exception):
+            # Part of the reply may already have been spoken; keep it for history.
+            raise _StreamInterrupted(text.strip()) from exc
+        raise
+
+    if speaker is not None:
+        if buffer.strip():
+            sentences.put_nowait(buffer.strip())
+        sentences.put_nowait(None)
+    return text, speaker
 
 
 async def run_agent(
@@ -157,35 +370,56 @@ async def run_agent(
 
     # litellm.api_key = api_key
 
-    full_system_prompt = (
-        SYSTEM_PROMPT
-        + "\n"
-        + pp.pformat({k: v for k, v in TOOLS.items()})
-        + "\n"
-        + SYSTEM_PROMPT_AFTER_TOOL_CALLS
-    )
+    if output_sink is None:
+        from holo_chan.io.output_local import LocalSpeaker
 
-    # Initialize messages if not provided
+        async with LocalSpeaker() as speaker:
+            return await run_agent(user_query, messages, completion_func, speaker)
+
+    # Initialize messages if not provided. Callers passing their own history should
+    # keep reusing the same system message so the prompt prefix stays cacheable.
     if messages is None:
-        messages = [
-            build_message("system", full_system_prompt),
-        ]
+        messages = [SYSTEM_MESSAGE.copy()]
+
+    query_embedding = None
+    cache_text = user_query
+    if _semantic_cache_enabled():
+        cache_text = _semantic_cache_text(messages, user_query)
+        query_embedding = await asyncio.to_thread(_embed_query, cache_text)
 
     # Add user query to conversation
     messages.append(build_message("user", user_query))
 
-    completion = completion_func or _ai_completion
-    if output_sink is None:
-        from holo_chan.io.output_local import LocalSpeaker
-
-        speak_out = LocalSpeaker()
-    else:
-        speak_out = output_sink
-
     for turn in range(1, MAX_TURNS + 1):
+        speaking: asyncio.Task[None] | None = None
         try:
-            print("🧠 Calling LLM...")
-            assistant_msg = await completion(messages)
+            cached = None
+            if turn == 1 and query_embedding is not None:
+                cached = _semantic_cache_lookup(query_embedding)
+            if cached is not None:
+                print("♻️  Semantic cache hit")
+                assistant_msg = cached
+            else:
+                print("🧠 Calling LLM...")
+                if completion_func is None:
+                    assistant_msg, speaking = await _stream_and_speak(
+                        messages, output_sink
+                    )
+                else:
+                    assistant_msg = await completion_func(messages)
+                # Tool calls are never replayed: they would re-run the tool.
+                if (
+                    turn == 1
+                    and query_embedding is not None
+                    and assistant_msg
+                    and parse_tool_call(assistant_msg) is None
+                ):
+                    _semantic_cache_store(cache_text, query_embedding, assistant_msg)
+        except _StreamInterrupted as exc:
+            print(f"❌ LiteLLM API request failed: {exc.__cause__}", file=sys.stderr)
+            if exc.partial:
+                messages.append(build_message("assistant", exc.partial))
+            break
         except Exception as exc:
             print(f"❌ LiteLLM API request failed: {exc}", file=sys.stderr)
             break
@@ -207,8 +441,11 @@ async def run_agent(
             if not assistant_msg:
                 break
             messages.append(build_message("assistant", assistant_msg))
-            print("🗣️  Speaking response")
-            await speak_out.speak(assistant_msg)
+            if speaking is not None:
+                await speaking
+            else:
+                print("🗣️  Speaking response")
+                await output_sink.speak(assistant_msg)
             break
 
         tool_name, tool_args = parsed
@@ -221,9 +458,13 @@ async def run_agent(
 
         tool_result = call_tool(tool_name, tool_args)
 
-        messages.append(build_message("assistant", assistant_msg))
-        messages.append(
-            build_message("user", f"Result of `{tool_name}`: {tool_result}")
+        messages.extend(
+            (
+                build_message("assistant", assistant_msg),
+                build_message(
+                    "user", _RESULT_TMPL.format(name=tool_name, result=tool_result)
+                ),
+            )
         )
 
     return messages
@@ -1,17 +1,22 @@
 from __future__ import annotations
 
 import asyncio
+import math
 import socket
 from collections.abc import AsyncIterator
 from typing import Optional
 
 import numpy as np
 from discord.ext import voice_recv
+from numba import njit
+from scipy.signal import resample_poly
 
 from holo_chan.io.interfaces import InputSource
 from holo_chan.integrations.discord.session import DiscordSession
 from holo_chan.stt import STTConfig
 
+_SEND_COALESCE_BYTES = 8192
+
 
 class _DiscordSTTBridge:
     def __init__(self, config: STTConfig) -> None:
@@ -19,7 +24,8 @@ class _DiscordSTTBridge:
         self._socket: Optional[socket.socket] = None
         self._running = False
         self._audio_queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=50)
-        self._text_queue: asyncio.Queue[str] = asyncio.Queue()
+        # Transcriptions for the consumer; None marks the end of the stream.
+        self._text_queue: asyncio.Queue[str | None] = asyncio.Queue()
         self._send_task: Optional[asyncio.Task] = None
         self._recv_task: Optional[asyncio.Task] = None
         self._loop: Optional[asyncio.AbstractEventLoop] = None
@@ -37,7 +43,9 @@ class _DiscordSTTBridge:
                 f"❌ Failed to connect to STT server at {self._config.host}:{self._config.port}: {exc}"
             )
             raise
-        self._socket.settimeout(0.5)
+        # Small audio chunks should go out immediately rather than wait on Nagle.
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._socket.setblocking(False)
         print(f"✅ Connected to STT server at {self._config.host}:{self._config.port}")
         self._running = True
         self._send_task = asyncio.create_task(self._send_audio())
@@ -47,6 +55,7 @@ class _DiscordSTTBridge:
         if not self._running:
             return
         self._running = False
+        self._text_queue.put_nowait(None)
         if self._send_task:
             self._send_task.cancel()
             try:
@@ -68,84 +77,115 @@ class _DiscordSTTBridge:
             return
 
         def _put() -> None:
+            # Drop the oldest chunk when backed up; fresh audio matters more for STT.
             if self._audio_queue.full():
-                return
+                try:
+                    self._audio_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
             self._audio_queue.put_nowait(pcm)
 
         self._loop.call_soon_threadsafe(_put)
 
     async def _send_audio(self) -> None:
+        loop = asyncio.get_running_loop()
         while self._running:
             try:
                 if self._socket is None:
                     await asyncio.sleep(0.01)
                     continue
                 chunk = await self._audio_queue.get()
-                await asyncio.to_thread(self._socket.sendall, chunk)
-            except (BlockingIOError, TimeoutError):
-                await asyncio.sleep(0.01)
+                # Coalesce whatever else is queued into one send.
+                while len(chunk) < _SEND_COALESCE_BYTES:
+                    try:
+                        chunk += self._audio_queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                await loop.sock_sendall(self._socket, chunk)
             except Exception as exc:
                 if self._running:
                     print(f"Error sending audio: {exc}")
                 break
 
     async def _receive_transcriptions(self) -> None:
+        loop = asyncio.get_running_loop()
+        # Lines ("<start> <end> <text>\n") may be split across recv calls.
+        pending = bytearray()
         while self._running:
             try:
                 if self._socket is None:
                     await asyncio.sleep(0.01)
                     continue
-                data = await asyncio.to_thread(self._socket.recv, 4096)
+                data = await loop.sock_recv(self._socket, 4096)
                 if not data:
                     print("🛑 STT server closed the connection.")
                     self._running = False
+                    self._text_queue.put_nowait(None)
                     break
-                text = " ".join(data.decode().split(" ")[2:]).strip()
-                if text:
-                    await self._text_queue.put(text)
-            except (BlockingIOError, TimeoutError):
-                await asyncio.sleep(0.01)
+                pending.extend(data)
+                while (newline := pending.find(b"\n")) >= 0:
+                    parts = bytes(pending[:newline]).split(b" ", 2)
+                    del pending[: newline + 1]
+                    text = parts[2].decode("utf-8", "replace").strip() if len(parts) == 3 else ""
+                    if text:
+                        await self._text_queue.put(text)
             except Exception as exc:
                 if self._running:
                     print(f"Error receiving transcription: {exc}")
                 break
 
     async def transcriptions(self) -> AsyncIterator[str]:
-        while self._running or not self._text_queue.empty():
-            try:
-                text = await asyncio.wait_for(self._text_queue.get(), timeout=0.1)
-                if text:
-                    yield text
-            except asyncio.TimeoutError:
-                continue
-
-
-def _pcm_to_16k_mono(pcm: bytes, sample_rate: int = 48000) -> bytes:
+        while True:
+            text = await self._text_queue.get()
+            if text is None:
+                return
+            if text:
+                yield text
+
+
+@njit(cache=True)
+def _downmix_48k_to_16k(samples: np.ndarray, out: np.ndarray) -> int:
+    # Fused downmix + decimate: each output sample averages three stereo pairs.
+    n = samples.size // 6
+    for j in range(n):
+        i = j * 6
+        acc = 0
+        for k in range(6):
+            acc += samples[i + k]
+        out[j] = acc // 6
+    return n
+
+
+def _pcm_to_16k_mono(
+    pcm: bytes, sample_rate: int = 48000, out: Optional[np.ndarray] = None
+) -> bytes:
     if not pcm:
         return b""
     samples = np.frombuffer(pcm, dtype=np.int16)
     if samples.size == 0:
         return b""
-    if samples.size % 2 != 0:
-        samples = samples[:-1]
-    stereo = samples.reshape(-1, 2)
-    mono = stereo.mean(axis=1).astype(np.int16)
+    if sample_rate == 48000:
+        # `out` is a reusable scratch buffer; only allocate when it is too small.
+        if out is None or out.size < samples.size // 6:
+            out = np.empty(samples.size // 6, dtype=np.int16)
+        n = _downmix_48k_to_16k(samples, out)
+        return out[:n].tobytes()
+    stereo = samples[: samples.size & ~1].reshape(-1, 2)
+    # Integer downmix: avoids the float64 intermediate that `mean` allocates.
+    mono = ((stereo[:, 0].astype(np.int32) + stereo[:, 1]) >> 1).astype(np.int16)
     if sample_rate == 16000:
         return mono.tobytes()
-    if sample_rate == 48000:
-        return mono[::3].tobytes()
-    ratio = 16000 / sample_rate
-    new_len = max(1, int(len(mono) * ratio))
-    x_old = np.linspace(0, len(mono) - 1, num=len(mono))
-    x_new = np.linspace(0, len(mono) - 1, num=new_len)
-    resampled = np.interp(x_new, x_old, mono).astype(np.int16)
-    return resampled.tobytes()
+    g = math.gcd(sample_rate, 16000)
+    resampled = resample_poly(mono, 16000 // g, sample_rate // g)
+    return np.clip(resampled, -32768, 32767).astype(np.int16).tobytes()
 
 
 class _DiscordSTTSink(voice_recv.AudioSink):
     def __init__(self, bridge: _DiscordSTTBridge) -> None:
         super().__init__()
         self._bridge = bridge
+        # 200 ms of 16 kHz mono, reused across voice packets.
+        self._scratch = np.empty(3200, dtype=np.int16)
         self._logged_first_audio = False
         self._logged_opus_only = False
 
@@ -165,7 +205,7 @@ class _DiscordSTTSink(voice_recv.AudioSink):
             name = getattr(user, "display_name", None) or getattr(user, "name", "unknown")
             print(f"🎧 Receiving voice from {name}")
             self._logged_first_audio = True
-        converted = _pcm_to_16k_mono(pcm)
+        converted = _pcm_to_16k_mono(pcm, out=self._scratch)
         if converted:
             self._bridge.submit_audio(converted)
 
@@ -1,17 +1,19 @@
 from __future__ import annotations
 
 import asyncio
-import io
+import math
 import os
+import threading
+from collections import deque
 from typing import Optional
 
 import numpy as np
-import zmq
-import zmq.asyncio
+from scipy.signal import resample_poly
 
 import discord
 
 from holo_chan.io.interfaces import OutputSink
+from holo_chan.io.synthesis import SynthesisClient
 from holo_chan.integrations.discord.session import DiscordSession
 
 
@@ -28,47 +30,62 @@ def _env_int(name: str, default: int) -> int:
 def _resample_mono(samples: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
     if src_rate == dst_rate:
         return samples
-    ratio = dst_rate / src_rate
-    new_len = max(1, int(len(samples) * ratio))
-    x_old = np.linspace(0, len(samples) - 1, num=len(samples))
-    x_new = np.linspace(0, len(samples) - 1, num=new_len)
-    return np.interp(x_new, x_old, samples).astype(np.int16)
+    g = math.gcd(src_rate, dst_rate)
+    resampled = resample_poly(samples, dst_rate // g, src_rate // g)
+    return np.clip(resampled, -32768, 32767).astype(np.int16)
 
 
-def _to_48k_stereo(pcm: bytes, sample_rate: int) -> bytes:
+def _to_48k_stereo(pcm: bytes | memoryview, sample_rate: int) -> bytes:
     if not pcm:
         return b""
     mono = np.frombuffer(pcm, dtype=np.int16)
     if mono.size == 0:
         return b""
     mono = _resample_mono(mono, sample_rate, 48000)
-    stereo = np.repeat(mono[:, None], 2, axis=1).reshape(-1)
-    return stereo.astype(np.int16).tobytes()
-
-
-class _DiscordTTSClient:
-    def __init__(self, host: str, port: int) -> None:
-        self._host = host
-        self._port = port
-        self._context = zmq.asyncio.Context()
-        self._socket = self._context.socket(zmq.REQ)
-        print(f"🔌 Connecting to TTS server at {host}:{port}...")
-        try:
-            self._socket.connect(f"tcp://{host}:{port}")
-        except Exception as exc:
-            print(f"❌ Failed to connect to TTS server at {host}:{port}: {exc}")
-            raise
-        print(f"✅ Connected to TTS server at {host}:{port}")
-
-    async def synthesize(self, text: str) -> tuple[int, bytes]:
-        self._socket.send_unicode(text)
-        sampling_rate_bytes, audio_bytes = await self._socket.recv_multipart()
-        sample_rate = int.from_bytes(sampling_rate_bytes)
-        return sample_rate, audio_bytes
-
-    async def close(self) -> None:
-        self._socket.close(0)
-        self._context.term()
+    stereo = np.empty(2 * mono.size, dtype=np.int16)
+    stereo[0::2] = mono
+    stereo[1::2] = mono
+    return stereo.tobytes()
+
+
+# 20 ms of 48 kHz stereo int16, the frame size discord.py reads per tick.
+_FRAME_BYTES = 3840
+
+
+class _StreamingPCMSource(discord.AudioSource):
+    """PCM source that plays frames as they are fed and ends once drained."""
+
+    def __init__(self) -> None:
+        self._frames: deque[bytes] = deque()
+        self._lock = threading.Lock()
+        self._ended = False
+
+    def feed(self, pcm: bytes) -> bool:
+        """Queue PCM for playback; returns False if the source already ended."""
+        with self._lock:
+            if self._ended:
+                return False
+            for start in range(0, len(pcm), _FRAME_BYTES):
+                frame = pcm[start : start + _FRAME_BYTES]
+                if len(frame) < _FRAME_BYTES:
+                    frame += b"\x00" * (_FRAME_BYTES - len(frame))
+                self._frames.append(frame)
+            return True
+
+    def read(self) -> bytes:
+        with self._lock:
+            if self._frames:
+                return self._frames.popleft()
+            self._ended = True
+            return b""
+
+    def is_opus(self) -> bool:
+        return False
+
+    def cleanup(self) -> None:
+        with self._lock:
+            self._ended = True
+            self._frames.clear()
 
 
 class DiscordSpeaker(OutputSink):
@@ -81,7 +98,8 @@ class DiscordSpeaker(OutputSink):
         self._session = session
         host = tts_host or os.getenv("TTS_HOST", "localhost")
         port = tts_port or _env_int("TTS_PORT", 5511)
-        self._tts = _DiscordTTSClient(host, port)
+        self._tts = SynthesisClient(host, port)
+        self._source: Optional[_StreamingPCMSource] = None
 
     async def __aenter__(self) -> "DiscordSpeaker":
         return self
@@ -92,9 +110,15 @@ class DiscordSpeaker(OutputSink):
         pcm = _to_48k_stereo(audio_bytes, sample_rate)
         if not pcm:
             return
+        # Append to the source that is already playing so consecutive sentences
+        # run back to back; start a new one only once the previous has ended.
+        if self._source is not None and self._source.feed(pcm):
+            return
         while voice_client.is_playing():
-            await asyncio.sleep(0.05)
-        source = discord.PCMAudio(io.BytesIO(pcm))
+            await asyncio.sleep(0.02)
+        source = _StreamingPCMSource()
+        source.feed(pcm)
+        self._source = source
         voice_client.play(source)
 
     async def __aexit__(self, exc_type, exc, tb) -> None:
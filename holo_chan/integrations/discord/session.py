@@ -58,6 +58,7 @@ class DiscordSession:
         self._task: Optional[asyncio.Task] = None
         self._client = self._build_client()
         self._voice_client: Optional[voice_recv.VoiceRecvClient] = None
+        self._channel: Optional[discord.VoiceChannel] = None
 
     def _build_client(self) -> discord.Client:
         intents = discord.Intents.default()
@@ -74,10 +75,14 @@ class DiscordSession:
 
     async def __aenter__(self) -> "DiscordSession":
         self._task = asyncio.create_task(self._client.start(self.config.token))
-        done, _ = await asyncio.wait(
-            {self._task, asyncio.create_task(self._ready.wait())},
-            return_when=asyncio.FIRST_COMPLETED,
-        )
+        ready = asyncio.create_task(self._ready.wait())
+        try:
+            done, _ = await asyncio.wait(
+                {self._task, ready}, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            # Don't leave the waiter pending and unreferenced if startup fails.
+            ready.cancel()
         if self._task in done:
             exc = self._task.exception()
             if exc:
@@ -91,6 +96,7 @@ class DiscordSession:
     async def close(self) -> None:
         if self._voice_client and self._voice_client.is_connected():
             await self._voice_client.disconnect(force=True)
+        self._channel = None
         if self._client.is_closed():
             return
         await self._client.close()
@@ -100,10 +106,7 @@ class DiscordSession:
             except asyncio.CancelledError:
                 pass
 
-    async def get_voice_client(self) -> voice_recv.VoiceRecvClient:
-        await self._ready.wait()
-        if self._voice_client and self._voice_client.is_connected():
-            return self._voice_client
+    async def _resolve_channel(self) -> discord.VoiceChannel:
         channel = self._client.get_channel(self.config.voice_channel_id)
         if channel is None:
             channel = await self._client.fetch_channel(self.config.voice_channel_id)
@@ -111,6 +114,14 @@ class DiscordSession:
             raise ValueError(
                 f"Channel {self.config.voice_channel_id} is not a voice channel."
             )
+        self._channel = channel
+        return channel
+
+    async def get_voice_client(self) -> voice_recv.VoiceRecvClient:
+        await self._ready.wait()
+        if self._voice_client and self._voice_client.is_connected():
+            return self._voice_client
+        channel = self._channel or await self._resolve_channel()
         print(f"🔌 Connecting to Discord voice channel: {channel.name} ({channel.id})")
         self._voice_client = await channel.connect(
             cls=voice_recv.VoiceRecvClient,
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import numpy as np
+
+# Optional codec frame a TTS server may send between the sample rate and the
+# audio. Replies without it are plain int16 PCM.
+CODEC_PCM16 = b"\x00"
+CODEC_ULAW = b"\x01"
+
+
+def _ulaw_table() -> np.ndarray:
+    # G.711 µ-law expansion, bit-compatible with audioop.ulaw2lin(..., 2).
+    u = ~np.arange(256, dtype=np.int32) & 0xFF
+    exponent = (u >> 4) & 0x07
+    mantissa = u & 0x0F
+    magnitude = (((mantissa << 3) + 0x84) << exponent) - 0x84
+    return np.where(u & 0x80, -magnitude, magnitude).astype(np.int16)
+
+
+_ULAW_TO_PCM16 = _ulaw_table()
+
+
+def decode_pcm(codec: bytes, payload: bytes | memoryview) -> bytes | memoryview:
+    """Return int16 PCM for a TTS payload sent with the given codec frame."""
+    if codec == CODEC_PCM16:
+        return payload
+    if codec == CODEC_ULAW:
+        return _ULAW_TO_PCM16[np.frombuffer(payload, dtype=np.uint8)].tobytes()
+    raise ValueError(f"Unsupported TTS audio codec: {bytes(codec)!r}")
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
 from holo_chan.io.interfaces import OutputSink
-from holo_chan.tts import speak
+from holo_chan.tts import TTSClient
 
 
 class LocalSpeaker(OutputSink):
+    def __init__(self, tts: TTSClient | None = None) -> None:
+        self._tts = tts or TTSClient()
+
     async def speak(self, text: str) -> None:
-        await speak(text)
+        await self._tts.speak(text)
 
     async def __aenter__(self) -> "LocalSpeaker":
         return self
 
     async def __aexit__(self, exc_type, exc, tb) -> None:
-        return None
+        await self._tts.close()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import struct
+import sys
+from uuid import uuid4
+
+import zmq
+import zmq.asyncio
+
+from holo_chan.io.codec import CODEC_PCM16, decode_pcm
+
+# TTS replies start with the sample rate as a 4-byte big-endian unsigned int,
+# optionally followed by a codec frame (see holo_chan.io.codec).
+_SAMPLE_RATE_HEADER = struct.Struct(">I")
+
+
+class SynthesisClient:
+    """Requests speech from the remote TTS server; playback is up to the caller."""
+
+    def __init__(self, host: str, port: int) -> None:
+        self.host = host
+        self.port = port
+        # The process-wide context is shared with other ZMQ users, so this client
+        # only owns (and closes) its socket, never the context.
+        self._context = zmq.asyncio.Context.instance()
+        # DEALER keeps several synthesis requests in flight; each carries an id
+        # frame that the server echoes back, so replies can be matched to callers.
+        self._socket = self._context.socket(zmq.DEALER)
+        self._socket.setsockopt(zmq.IDENTITY, uuid4().bytes)
+        self._socket.setsockopt(zmq.LINGER, 0)
+        self._request_ids = itertools.count()
+        self._pending: dict[bytes, asyncio.Future[tuple[int, memoryview]]] = {}
+        self._recv_task: asyncio.Task | None = None
+        print(f"🔌 Connecting to TTS server at {host}:{port}...")
+        try:
+            self._socket.connect(f"tcp://{host}:{port}")
+        except Exception as exc:
+            print(
+                f"❌ Failed to connect to TTS server at {host}:{port}: {exc}",
+                file=sys.stderr,
+            )
+            raise
+        print(f"✅ Connected to TTS server at {host}:{port}")
+
+    async def synthesize(self, text: str) -> tuple[int, memoryview]:
+        """Return `(sample_rate, pcm)` for `text`, with `pcm` as mono int16."""
+        if self._recv_task is None:
+            self._recv_task = asyncio.create_task(self._receive_audio())
+        req_id = next(self._request_ids).to_bytes(8, "little")
+        future: asyncio.Future[tuple[int, memoryview]] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._pending[req_id] = future
+        await self._socket.send_multipart([req_id, b"", text.encode()])
+        return await future
+
+    async def _receive_audio(self) -> None:
+        try:
+            while True:
+                # copy=False keeps the PCM in the zmq.Frame; callers get a
+                # memoryview onto it instead of another copy.
+                frames = await self._socket.recv_multipart(copy=False)
+                req_id, _, sampling_rate_frame, *codec_frame, audio_frame = frames
+                future = self._pending.pop(req_id.bytes, None)
+                if future is None or future.done():
+                    continue
+                header = sampling_rate_frame.buffer
+                (sample_rate,) = _SAMPLE_RATE_HEADER.unpack_from(header)
+                codec = codec_frame[0].bytes if codec_frame else CODEC_PCM16
+                try:
+                    audio = memoryview(decode_pcm(codec, audio_frame.buffer))
+                except ValueError as exc:
+                    future.set_exception(exc)
+                    continue
+                future.set_result((sample_rate, audio))
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            print(f"Error receiving TTS audio: {exc}", file=sys.stderr)
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(exc)
+            self._pending.clear()
+            self._recv_task = None
+
+    async def close(self) -> None:
+        """Cancel outstanding requests and close the socket."""
+        if self._recv_task:
+            self._recv_task.cancel()
+            try:
+                await self._recv_task
+            except asyncio.CancelledError:
+                pass
+            self._recv_task = None
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        self._socket.close(0)
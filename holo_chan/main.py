@@ -1,13 +1,12 @@
 import asyncio
 import os
-import re
 import sys
 from contextlib import AsyncExitStack
 from typing import TYPE_CHECKING
 
 from dotenv import load_dotenv
 
-from holo_chan.agent import FULL_SYSTEM_PROMPT, build_message, run_agent
+from holo_chan.agent import SYSTEM_MESSAGE, run_agent, split_complete_sentences
 from holo_chan.io.input_local import LocalInputSource
 from holo_chan.io.interfaces import InputSource, OutputSink
 from holo_chan.stt import STTConfig
@@ -83,25 +82,6 @@ async def _maybe_enter(stack: AsyncExitStack, obj):
         return obj
     return await stack.enter_async_context(obj)
 
-_SENTENCE_BOUNDARY_RE = re.compile(r"([.!?,;:])")
-
-
-def _split_complete_sentences(text: str) -> tuple[list[str], str]:
-    parts = _SENTENCE_BOUNDARY_RE.split(text)
-    if len(parts) == 1:
-        return [], text.strip()
-
-    sentences: list[str] = []
-    for i in range(0, len(parts) - 1, 2):
-        segment = parts[i].strip()
-        delimiter = parts[i + 1]
-        if segment:
-            sentences.append(f"{segment}{delimiter}")
-        elif delimiter.strip():
-            sentences.append(delimiter)
-    remainder = parts[-1].strip() if len(parts) % 2 == 1 else ""
-    return sentences, remainder
-
 
 async def _process_transcriptions(
     incoming: asyncio.Queue[str | None],
@@ -109,25 +89,50 @@ async def _process_transcriptions(
     output_sink: OutputSink,
 ) -> list[dict[str, str]]:
     buffer = ""
+    # `buffer[:scan_off]` is known to contain no sentence boundary.
+    scan_off = 0
     pending: list[str] = []
     in_flight: asyncio.Task[list[dict[str, str]]] | None = None
+    getter: asyncio.Task[str | None] | None = None
     finished = False
-    no_item = object()
 
     while True:
-        try:
-            text = await asyncio.wait_for(incoming.get(), timeout=0.05)
-        except asyncio.TimeoutError:
-            text = no_item
-
-        if text is None:
-            finished = True
-        elif text is not no_item:
-            buffer = f"{buffer} {text}".strip()
-            sentences, remainder = _split_complete_sentences(buffer)
-            if sentences:
-                pending.extend(sentences)
-            buffer = remainder
+        received: list[str | None] = []
+        if not finished:
+            if in_flight is None and getter is None:
+                received.append(await incoming.get())
+            else:
+                # Wake on new input or on the agent run finishing, whichever is first.
+                if getter is None:
+                    getter = asyncio.create_task(incoming.get())
+                waiters = {getter} if in_flight is None else {getter, in_flight}
+                await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    received.append(getter.result())
+                    getter = None
+            if received:
+                # Drain the rest of a burst without going back to the event loop.
+                while True:
+                    try:
+                        received.append(incoming.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+        elif in_flight is not None:
+            await asyncio.wait({in_flight})
+
+        if received:
+            for text in received:
+                if text is None:
+                    finished = True
+                    break
+                buffer = f"{buffer} {text}".strip()
+            sentences, buffer = split_complete_sentences(buffer, scan_off)
+            pending.extend(sentences)
+            scan_off = len(buffer)
+
+        if in_flight is not None and in_flight.done():
+            messages = in_flight.result()
+            in_flight = None
 
         if in_flight is None and pending:
             batch = " ".join(pending).strip()
@@ -141,13 +146,10 @@ async def _process_transcriptions(
                 )
             )
 
-        if in_flight is not None and in_flight.done():
-            messages = in_flight.result()
-            in_flight = None
-
         if finished and in_flight is None and not pending and buffer:
             batch = buffer
             buffer = ""
+            scan_off = 0
             print(f"\nUser: {batch}")
             in_flight = asyncio.create_task(
                 run_agent(
@@ -170,9 +172,7 @@ async def main() -> None:
     if not api_key:
         sys.exit("❌ Environment variable GROQ_API_KEY not set.")
 
-    messages: list[dict[str, str]] = [
-        build_message("system", FULL_SYSTEM_PROMPT),
-    ]
+    messages: list[dict[str, str]] = [SYSTEM_MESSAGE.copy()]
 
     session = None
     if use_discord:
@@ -210,6 +210,9 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
+    if sys.platform.startswith("win"):
+        # pyzmq's asyncio sockets need a selector loop on Windows.
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())  # type: ignore
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
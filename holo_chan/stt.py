@@ -4,9 +4,10 @@ Streams microphone audio to a Whisper server and yields transcriptions.
 """
 
 import asyncio
-import queue
+import math
 import socket
 import sys
+from collections import deque
 from dataclasses import dataclass
 from typing import AsyncGenerator, Optional
 
@@ -18,6 +19,34 @@ SAMPLE_RATE = 16000
 CHANNELS = 1
 CHUNK = 1024
 DTYPE = np.int16
+MAX_CHUNKS_PER_SEND = 8
+# Chunks quieter than this RMS (int16 units) are not sent once the hangover of
+# consecutive quiet chunks has elapsed (see `STTListener._hangover_chunks`).
+SILENCE_RMS = 300
+# Large enough to hold ~10 s of 16 kHz mono audio without blocking a send.
+SOCKET_BUFFER_BYTES = 512 * 1024
+
+
+async def _connect(host: str, port: int) -> socket.socket:
+    """Open a non-blocking, low-latency connection to the Whisper server."""
+    print(f"🔌 Connecting to STT server at {host}:{port}...")
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_BYTES)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_BYTES)
+    # Non-blocking so the event loop can drive sends and receives directly.
+    sock.setblocking(False)
+    try:
+        await asyncio.get_running_loop().sock_connect(sock, (host, port))
+    except Exception as exc:
+        sock.close()
+        print(
+            f"❌ Failed to connect to STT server at {host}:{port}: {exc}",
+            file=sys.stderr,
+        )
+        raise
+    print(f"✅ Connected to STT server at {host}:{port}")
+    return sock
 
 
 @dataclass
@@ -37,8 +66,16 @@ class STTListener:
         self._socket: Optional[socket.socket] = None
         self._stream: Optional[sd.InputStream] = None
         self._running = False
-        self._queue: asyncio.Queue[str] = asyncio.Queue()
-        self._audio_queue: Optional[queue.Queue[bytes]] = None
+        # Single producer/consumer: a deque plus a one-shot waiter future is
+        # cheaper than an asyncio.Queue.
+        self._queue: deque[str] = deque()
+        self._waiter: Optional[asyncio.Future[None]] = None
+        self._closed = asyncio.Event()
+        self._audio_queue: Optional[asyncio.Queue[bytes]] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._hangover_chunks = 0
+        self._quiet_chunks = 0
+        self._preroll: Optional[bytes] = None
         self._receive_task: Optional[asyncio.Task] = None
         self._send_task: Optional[asyncio.Task] = None
 
@@ -54,20 +91,19 @@ class STTListener:
         if self._running:
             return
 
-        # Connect to the Whisper server
-        print(f"🔌 Connecting to STT server at {self.config.host}:{self.config.port}...")
-        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        try:
-            self._socket.connect((self.config.host, self.config.port))
-        except Exception as exc:
-            print(
-                f"❌ Failed to connect to STT server at {self.config.host}:{self.config.port}: {exc}",
-                file=sys.stderr,
-            )
-            raise
-        print(f"✅ Connected to STT server at {self.config.host}:{self.config.port}")
-        # Use a timeout to prevent blocking indefinitely on recv.
-        self._socket.settimeout(0.5)
+        # Each listener owns its connection: the server's transcript stream is
+        # per session and only one reader may wait on a socket at a time.
+        self._socket = await _connect(self.config.host, self.config.port)
+        self._loop = asyncio.get_running_loop()
+        # Queue audio chunks from the callback to a sender task.
+        self._audio_queue = asyncio.Queue(maxsize=20)
+        # whisper_online_server waits for `min_chunk` (chunk_ms) of audio and only
+        # commits a word once the next chunk agrees with it, so keep sending
+        # silence for two chunks after speech or the last words stay pending.
+        chunk_duration_ms = 1000 * CHUNK / SAMPLE_RATE
+        self._hangover_chunks = math.ceil(2 * self.config.chunk_ms / chunk_duration_ms)
+        self._quiet_chunks = self._hangover_chunks + 1
+        self._preroll = None
 
         # Set up audio stream with callback
         self._stream = sd.InputStream(
@@ -79,12 +115,11 @@ class STTListener:
         )
         self._stream.start()
 
-        # Queue audio chunks from the callback to a sender task.
-        self._audio_queue = queue.Queue(maxsize=20)
         self._send_task = asyncio.create_task(self._send_audio())
 
         # Start receiving transcriptions in background
         self._receive_task = asyncio.create_task(self._receive_transcriptions())
+        self._closed.clear()
         self._running = True
 
     async def stop(self) -> None:
@@ -93,6 +128,7 @@ class STTListener:
             return
 
         self._running = False
+        self._close_transcriptions()
         print("🛑 Stopping STT listener")
 
         # Cancel receive task
@@ -124,24 +160,48 @@ class STTListener:
         """Callback for audio data - sends to socket."""
         if status:
             print(status, file=sys.stderr)
-        if self._audio_queue:
-            try:
-                self._audio_queue.put_nowait(indata.tobytes())
-            except queue.Full:
-                # Drop audio if the sender is temporarily backed up.
-                pass
+        if self._audio_queue is None or self._loop is None:
+            return
+        # Skip long silences, keeping a hangover so the server commits the speech
+        # tail and one chunk of pre-roll so soft onsets aren't clipped.
+        pcm = indata.tobytes()
+        samples = indata.reshape(-1).astype(np.float32)
+        mean_square = float(np.dot(samples, samples)) / max(samples.size, 1)
+        if mean_square >= SILENCE_RMS * SILENCE_RMS:
+            if self._quiet_chunks > self._hangover_chunks and self._preroll:
+                pcm = self._preroll + pcm
+            self._quiet_chunks = 0
+        else:
+            self._quiet_chunks += 1
+            if self._quiet_chunks > self._hangover_chunks:
+                self._preroll = pcm
+                return
+        self._preroll = None
+        audio_queue = self._audio_queue
+
+        def _put() -> None:
+            # Drop audio if the sender is temporarily backed up.
+            if not audio_queue.full():
+                audio_queue.put_nowait(pcm)
+
+        self._loop.call_soon_threadsafe(_put)
 
     async def _send_audio(self) -> None:
         """Background task to send queued audio to server."""
+        loop = asyncio.get_running_loop()
         while self._running:
             try:
                 if self._socket is None or self._audio_queue is None:
                     await asyncio.sleep(0.01)
                     continue
-                chunk = await asyncio.to_thread(self._audio_queue.get)
-                await asyncio.to_thread(self._socket.sendall, chunk)
-            except (BlockingIOError, TimeoutError):
-                await asyncio.sleep(0.01)
+                parts = [await self._audio_queue.get()]
+                # Send everything already queued in one write, up to a bound.
+                while len(parts) < MAX_CHUNKS_PER_SEND:
+                    try:
+                        parts.append(self._audio_queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                await loop.sock_sendall(self._socket, b"".join(parts))
             except Exception as e:
                 if self._running:
                     print(f"Error sending audio: {e}", file=sys.stderr)
@@ -149,36 +209,61 @@ class STTListener:
 
     async def _receive_transcriptions(self) -> None:
         """Background task to receive transcriptions from server."""
+        loop = asyncio.get_running_loop()
+        # Lines ("<start> <end> <text>\n") may be split across recv calls.
+        recv_buf = bytearray()
         while self._running:
             try:
                 if self._socket is None:
                     await asyncio.sleep(0.01)
                     continue
-                data = await asyncio.to_thread(self._socket.recv, 4096)
+                data = await loop.sock_recv(self._socket, 4096)
                 if not data:
                     # Server closed the connection.
                     print("🛑 STT server closed the connection.")
                     self._running = False
+                    self._close_transcriptions()
                     break
-                text = " ".join(data.decode().split(" ")[2:]).strip()
-                if text:
-                    await self._queue.put(text)
-            except (BlockingIOError, TimeoutError):
-                await asyncio.sleep(0.01)
+                recv_buf.extend(data)
+                while (newline := recv_buf.find(b"\n")) >= 0:
+                    line = bytes(recv_buf[:newline])
+                    del recv_buf[: newline + 1]
+                    # Drop the leading "<start> <end>" timestamps; decode only the text.
+                    parts = line.split(b" ", 2)
+                    text = parts[2].decode("utf-8", "replace").strip() if len(parts) == 3 else ""
+                    if text:
+                        self._push_text(text)
             except Exception as e:
                 if self._running:
                     print(f"Error receiving transcription: {e}", file=sys.stderr)
                 break
 
+    def _wake_consumer(self) -> None:
+        waiter = self._waiter
+        self._waiter = None
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def _push_text(self, text: str) -> None:
+        """Queue a transcription and wake the consumer if it is waiting."""
+        self._queue.append(text)
+        self._wake_consumer()
+
+    def _close_transcriptions(self) -> None:
+        """Let the consumer finish once the queued transcriptions are drained."""
+        self._closed.set()
+        self._wake_consumer()
+
     async def transcriptions(self) -> AsyncGenerator[str, None]:
         """Yield transcriptions as they arrive."""
-        while self._running or not self._queue.empty():
-            try:
-                text = await asyncio.wait_for(self._queue.get(), timeout=0.1)
-                if text:
-                    yield text
-            except asyncio.TimeoutError:
+        while True:
+            if self._queue:
+                yield self._queue.popleft()
                 continue
+            if self._closed.is_set():
+                return
+            self._waiter = asyncio.get_running_loop().create_future()
+            await self._waiter
 
 
 async def listen(config: Optional[STTConfig] = None) -> AsyncGenerator[str, None]:
@@ -1,21 +1,22 @@
 import asyncio
 import os
+import queue
 import sys
+import threading
+from collections import OrderedDict
 
-import numpy as np
 import sounddevice as sd
-import zmq
-import zmq.asyncio
 from dotenv import load_dotenv
 
-if sys.platform.startswith("win"):
-    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())  # type: ignore
+from holo_chan.io.synthesis import SynthesisClient
 
 # ----------------------------------------------------------------------
 # 🎛️  CONFIGURATION
 
 load_dotenv()
 
+TTS_CACHE_SIZE = 256
+
 
 def _env_int(name: str, default: int) -> int:
     value = os.getenv(name)
@@ -27,50 +28,110 @@ def _env_int(name: str, default: int) -> int:
         raise ValueError(f"{name} must be an integer, got {value!r}") from exc
 
 
-# Set up ZeroMQ client
-context = zmq.asyncio.Context()
-socket = context.socket(zmq.REQ)
-tts_host = os.getenv("TTS_HOST", "localhost")
-tts_port = _env_int("TTS_PORT", 5511)
-print(f"🔌 Connecting to TTS server at {tts_host}:{tts_port}...")
-try:
-    socket.connect(f"tcp://{tts_host}:{tts_port}")
-except Exception as exc:
-    print(
-        f"❌ Failed to connect to TTS server at {tts_host}:{tts_port}: {exc}",
-        file=sys.stderr,
-    )
-    raise
-print(f"✅ Connected to TTS server at {tts_host}:{tts_port}")
-
-is_speaking = False
-_logged_tts_connection = False
+class TTSClient:
+    """Client for the remote TTS server that plays replies on the local device.
+
+    Each client owns its own ZeroMQ connection, playback stream and speaking
+    state, so several output sinks can run side by side.
+    """
+
+    def __init__(self, host: str | None = None, port: int | None = None) -> None:
+        self.host = host or os.getenv("TTS_HOST", "localhost")
+        self.port = port or _env_int("TTS_PORT", 5511)
+        self._synthesis = SynthesisClient(self.host, self.port)
+        # LRU of recent utterances so repeated phrases skip the server entirely.
+        self._cache: OrderedDict[str, tuple[int, memoryview]] = OrderedDict()
+
+        # Set while nothing is playing; `_speak_lock` makes claiming it atomic.
+        self._speaking_done = asyncio.Event()
+        self._speaking_done.set()
+        self._speak_lock = asyncio.Lock()
+        self._logged_connection = False
+
+        self._out_stream: sd.RawOutputStream | None = None
+        # One resident thread plays queued audio and signals `_speaking_done` when
+        # each write returns (i.e. the last block has been handed to the device).
+        self._playback_jobs: queue.SimpleQueue[
+            tuple[asyncio.AbstractEventLoop, sd.RawOutputStream, memoryview] | None
+        ] = queue.SimpleQueue()
+        self._playback_thread = threading.Thread(
+            target=self._playback_worker, name="tts-playback", daemon=True
+        )
+        self._playback_thread.start()
+
+    def _output_stream(self, sample_rate: int) -> sd.RawOutputStream:
+        """Return the output stream, reopening it if the sample rate changed."""
+        if self._out_stream is None or self._out_stream.samplerate != sample_rate:
+            if self._out_stream is not None:
+                # stop() lets the device drain; close() alone drops its buffers.
+                self._out_stream.stop()
+                self._out_stream.close()
+            self._out_stream = sd.RawOutputStream(
+                samplerate=sample_rate, channels=1, dtype="int16"
+            )
+            self._out_stream.start()
+        return self._out_stream
+
+    def _playback_worker(self) -> None:
+        while (job := self._playback_jobs.get()) is not None:
+            loop, stream, audio = job
+            try:
+                stream.write(audio)
+            except Exception as exc:
+                print(f"Error playing TTS audio: {exc}", file=sys.stderr)
+            finally:
+                loop.call_soon_threadsafe(self._speaking_done.set)
+        if self._out_stream is not None:
+            self._out_stream.stop()
+            self._out_stream.close()
+            self._out_stream = None
+
+    async def synthesize(self, text: str) -> tuple[int, memoryview]:
+        """Return `(sample_rate, pcm)` for `text`, from the cache or the TTS server."""
+        cached = self._cache.get(text)
+        if cached is not None:
+            self._cache.move_to_end(text)
+            return cached
+        result = await self._synthesis.synthesize(text)
+        self._cache[text] = result
+        if len(self._cache) > TTS_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return result
+
+    async def speak(self, text: str) -> None:
+        if not self._logged_connection:
+            print(f"🔊 TTS -> {self.host}:{self.port}")
+            self._logged_connection = True
+        # Synthesize while any previous utterance is still playing
+        sample_rate, audio = await self.synthesize(text)
+
+        # Wait for the model to stop speaking
+        async with self._speak_lock:
+            await self._speaking_done.wait()
+            self._speaking_done.clear()
+
+        try:
+            # Opening a PortAudio stream can block for a while; keep it off-loop
+            # so the agent can keep streaming the next reply meanwhile.
+            stream = await asyncio.to_thread(self._output_stream, sample_rate)
+        except BaseException:
+            self._speaking_done.set()
+            raise
+
+        self._playback_jobs.put((asyncio.get_running_loop(), stream, audio))
+
+    async def close(self) -> None:
+        """Close the connection; audio already queued still finishes playing."""
+        await self._synthesis.close()
+        self._playback_jobs.put(None)
+
+
+_default_client: TTSClient | None = None
 
 
 async def speak(text: str) -> None:
-    global _logged_tts_connection
-    if not _logged_tts_connection:
-        print(f"🔊 TTS -> {tts_host}:{tts_port}")
-        _logged_tts_connection = True
-    # Wait for the model to stop speaking
-    global is_speaking
-    while is_speaking is True:
-        await asyncio.sleep(1)
-    is_speaking = True
-
-    # Send text to TTS server and receive audio data
-    socket.send_unicode(text)
-
-    # Receive sampling rate and audio data together
-    sampling_rate_bytes, audio_bytes = await socket.recv_multipart()
-    sample_rate = int.from_bytes(sampling_rate_bytes)
-
-    audio = np.frombuffer(audio_bytes, dtype=np.int16)
-    sd.play(audio, samplerate=sample_rate)
-
-    async def _watch_sd():
-        global is_speaking
-        await asyncio.to_thread(sd.wait)
-        is_speaking = False
-
-    asyncio.create_task(_watch_sd())
+    """Speak `text` through a shared default client, connected on first use."""
+    global _default_client
+    if _default_client is None:
+        _default_client = TTSClient()
+    await _default_client.speak(text)
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from holo_chan.io.codec import CODEC_PCM16, CODEC_ULAW, decode_pcm
+
+
+def test_decode_pcm_passes_pcm16_through():
+    pcm = np.array([0, 1, -1, 32767, -32768], dtype=np.int16).tobytes()
+
+    assert decode_pcm(CODEC_PCM16, pcm) is pcm
+
+
+@pytest.mark.parametrize(
+    ("code", "expected"),
+    [
+        (0x00, -32124),
+        (0x0F, -16764),
+        (0x7E, -8),
+        (0x7F, 0),
+        (0x80, 32124),
+        (0x8F, 16764),
+        (0xFE, 8),
+        (0xFF, 0),
+    ],
+)
+def test_decode_pcm_expands_ulaw_per_g711(code: int, expected: int):
+    pcm = decode_pcm(CODEC_ULAW, bytes([code]))
+
+    assert np.frombuffer(pcm, dtype=np.int16).tolist() == [expected]
+
+
+def test_decode_pcm_rejects_unknown_codec():
+    with pytest.raises(ValueError, match="codec"):
+        decode_pcm(b"\x02", b"\x00\x00")
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from holo_chan import main
+
+
+class _FakeAgent:
+    """Stands in for `run_agent`; each run waits until the test releases it."""
+
+    def __init__(self) -> None:
+        self.batches: list[str] = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, batch, messages, output_sink=None):
+        self.batches.append(batch)
+        await self.release.wait()
+        return [*messages, {"role": "user", "content": batch}]
+
+
+class _SilentSink:
+    async def speak(self, text: str) -> None:
+        pass
+
+
+async def _settle() -> None:
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def fake_agent(monkeypatch: pytest.MonkeyPatch) -> _FakeAgent:
+    fake = _FakeAgent()
+    monkeypatch.setattr(main, "run_agent", fake)
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_burst_is_sent_as_one_batch(fake_agent: _FakeAgent):
+    incoming: asyncio.Queue[str | None] = asyncio.Queue()
+    for text in ("Hello there.", "How are", "you?", None):
+        incoming.put_nowait(text)
+
+    messages = await asyncio.wait_for(
+        main._process_transcriptions(incoming, [], _SilentSink()),
+        timeout=1,
+    )
+
+    assert fake_agent.batches == ["Hello there. How are you?"]
+    assert [m["content"] for m in messages] == ["Hello there. How are you?"]
+
+
+@pytest.mark.asyncio
+async def test_sentences_during_a_run_are_batched_for_the_next(
+    fake_agent: _FakeAgent,
+):
+    incoming: asyncio.Queue[str | None] = asyncio.Queue()
+    fake_agent.release.clear()
+    processor = asyncio.create_task(
+        main._process_transcriptions(incoming, [], _SilentSink())
+    )
+
+    incoming.put_nowait("One.")
+    await _settle()
+    assert fake_agent.batches == ["One."]
+
+    incoming.put_nowait("Two.")
+    incoming.put_nowait("Three.")
+    await _settle()
+    assert fake_agent.batches == ["One."]
+
+    fake_agent.release.set()
+    await _settle()
+    incoming.put_nowait(None)
+    messages = await asyncio.wait_for(processor, timeout=1)
+
+    assert fake_agent.batches == ["One.", "Two. Three."]
+    assert [m["content"] for m in messages] == ["One.", "Two. Three."]
+
+
+@pytest.mark.asyncio
+async def test_end_mid_run_flushes_partial_sentence(fake_agent: _FakeAgent):
+    incoming: asyncio.Queue[str | None] = asyncio.Queue()
+    fake_agent.release.clear()
+    processor = asyncio.create_task(
+        main._process_transcriptions(incoming, [], _SilentSink())
+    )
+
+    incoming.put_nowait("First one.")
+    await _settle()
+    incoming.put_nowait("and then")
+    incoming.put_nowait(None)
+    await _settle()
+    assert not processor.done()
+
+    fake_agent.release.set()
+    messages = await asyncio.wait_for(processor, timeout=1)
+
+    assert fake_agent.batches == ["First one.", "and then"]
+    assert [m["content"] for m in messages] == ["First one.", "and then"]
@@ -1,27 +1,34 @@
 import pytest
 
-from holo_chan import main
+from holo_chan import agent
+
+_BASE_MESSAGES = [agent.build_message("system", "sys")]
+
+
+class _FakeSink:
+    def __init__(self) -> None:
+        self.spoken: list[str] = []
+
+    async def speak(self, text: str) -> None:
+        self.spoken.append(text)
 
 
 @pytest.mark.asyncio
 async def test_run_agent_plain_response_calls_speak(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setenv("GROQ_API_KEY", "test-key")
-    spoken: list[str] = []
+    sink = _FakeSink()
 
     async def fake_completion(_messages: list[dict[str, str]]):
         return "Hello there."
 
-    async def fake_speak(text: str) -> None:
-        spoken.append(text)
-
-    messages = await main.run_agent(
+    messages = await agent.run_agent(
         "Hi",
-        messages=[main.build_message("system", "sys")],
+        list(_BASE_MESSAGES),
         completion_func=fake_completion,
-        speak_func=fake_speak,
+        output_sink=sink,
     )
 
-    assert spoken == ["Hello there."]
+    assert sink.spoken == ["Hello there."]
     assert messages[-1]["role"] == "assistant"
     assert messages[-1]["content"] == "Hello there."
 
@@ -29,42 +36,144 @@ async def test_run_agent_plain_response_calls_speak(monkeypatch: pytest.MonkeyPa
 @pytest.mark.asyncio
 async def test_run_agent_done_tool_does_not_speak(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setenv("GROQ_API_KEY", "test-key")
-    spoken: list[str] = []
+    sink = _FakeSink()
 
     async def fake_completion(_messages: list[dict[str, str]]):
         return '{"tool_calls":{"name":"done","arguments":{}}}'
 
-    async def fake_speak(text: str) -> None:
-        spoken.append(text)
-
-    messages = await main.run_agent(
+    messages = await agent.run_agent(
         "Hi",
-        messages=[main.build_message("system", "sys")],
+        list(_BASE_MESSAGES),
         completion_func=fake_completion,
-        speak_func=fake_speak,
+        output_sink=sink,
     )
 
-    assert spoken == []
+    assert sink.spoken == []
     assert messages[-1]["role"] == "assistant"
 
 
 @pytest.mark.asyncio
 async def test_run_agent_completion_error_does_not_exit(
-    monkeypatch: pytest.MonkeyPatch,
+    monkeypatch: pytest.MonkeyPatch
 ):
     monkeypatch.setenv("GROQ_API_KEY", "test-key")
 
     async def fake_completion(_messages: list[dict[str, str]]):
         raise RuntimeError("boom")
 
-    async def fake_speak(_text: str) -> None:
-        return None
-
-    messages = await main.run_agent(
+    messages = await agent.run_agent(
         "Hi",
-        messages=[main.build_message("system", "sys")],
+        list(_BASE_MESSAGES),
         completion_func=fake_completion,
-        speak_func=fake_speak,
+        output_sink=_FakeSink(),
     )
 
     assert messages[0]["role"] == "system"
+
+
+def _fake_stream(*deltas: str, error: Exception | None = None):
+    async def _stream(_messages: list[dict[str, str]]):
+        for delta in deltas:
+            yield delta
+        if error is not None:
+            raise error
+
+    return _stream
+
+
+@pytest.mark.asyncio
+async def test_run_agent_streaming_speaks_each_sentence(
+    monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    monkeypatch.setattr(
+        agent,
+        "_ai_completion_stream",
+        _fake_stream("Hello ", "there. How", " are you", "? Fine"),
+    )
+    sink = _FakeSink()
+
+    messages = await agent.run_agent("Hi", list(_BASE_MESSAGES), output_sink=sink)
+
+    assert sink.spoken == ["Hello there.", "How are you?", "Fine"]
+    assert messages[-1] == agent.build_message(
+        "assistant", "Hello there. How are you? Fine"
+    )
+
+
+@pytest.mark.parametrize(
+    ("deltas", "expected"),
+    [
+        (("It costs 3", ".5 dollars. Ok"), ["It costs 3.5 dollars.", "Ok"]),
+        (("Meet at 3:", "30, then", " lunch."), ["Meet at 3:30,", "then lunch."]),
+        (("Wait.", "..", " ok"), ["Wait...", "ok"]),
+        (("Visit example.com", " today. Bye"), ["Visit example.com today.", "Bye"]),
+        (("Really?", " . Yes"), ["Really?.", "Yes"]),
+    ],
+)
+@pytest.mark.asyncio
+async def test_run_agent_streaming_keeps_inline_punctuation(
+    monkeypatch: pytest.MonkeyPatch, deltas: tuple[str, ...], expected: list[str]
+):
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    monkeypatch.setattr(agent, "_ai_completion_stream", _fake_stream(*deltas))
+    sink = _FakeSink()
+
+    await agent.run_agent("Hi", list(_BASE_MESSAGES), output_sink=sink)
+
+    assert sink.spoken == expected
+
+
+@pytest.mark.asyncio
+async def test_run_agent_streaming_holds_back_tool_calls(
+    monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    monkeypatch.setattr(
+        agent,
+        "_ai_completion_stream",
+        _fake_stream(' {"tool_calls":', '{"name":"done","arguments":{}}}'),
+    )
+    sink = _FakeSink()
+
+    messages = await agent.run_agent("Hi", list(_BASE_MESSAGES), output_sink=sink)
+
+    assert sink.spoken == []
+    assert messages[-1]["role"] == "assistant"
+
+
+@pytest.mark.asyncio
+async def test_run_agent_streaming_sink_error_keeps_reply(
+    monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    monkeypatch.setattr(agent, "_ai_completion_stream", _fake_stream("Hello there."))
+
+    class _FailingSink:
+        async def speak(self, text: str) -> None:
+            raise RuntimeError("tts down")
+
+    messages = list(_BASE_MESSAGES)
+    with pytest.raises(RuntimeError, match="tts down"):
+        await agent.run_agent("Hi", messages, output_sink=_FailingSink())
+
+    assert [m["role"] for m in messages] == ["system", "user", "assistant"]
+    assert messages[-1]["content"] == "Hello there."
+
+
+@pytest.mark.asyncio
+async def test_run_agent_streaming_error_keeps_partial_reply(
+    monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    monkeypatch.setattr(
+        agent,
+        "_ai_completion_stream",
+        _fake_stream("Hello there. ", "And", error=RuntimeError("boom")),
+    )
+
+    messages = await agent.run_agent(
+        "Hi", list(_BASE_MESSAGES), output_sink=_FakeSink()
+    )
+
+    assert messages[-1] == agent.build_message("assistant", "Hello there. And")
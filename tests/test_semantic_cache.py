@@ -0,0 +1,69 @@
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+from holo_chan import agent
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(agent, "_SEMANTIC_CACHE", OrderedDict())
+
+
+def _unit(*values: float) -> np.ndarray:
+    vector = np.array(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def test_lookup_returns_response_above_threshold():
+    agent._semantic_cache_store("hi", _unit(1, 0), "Hello.")
+
+    assert agent._semantic_cache_lookup(_unit(1, 0.1)) == "Hello."
+    assert agent._semantic_cache_lookup(_unit(1, 0.5)) is None
+    assert agent._semantic_cache_lookup(_unit(0, 1)) is None
+
+
+def test_store_evicts_least_recently_used(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(agent, "SEMANTIC_CACHE_SIZE", 2)
+    agent._semantic_cache_store("a", _unit(1, 0, 0), "A")
+    agent._semantic_cache_store("b", _unit(0, 1, 0), "B")
+    assert agent._semantic_cache_lookup(_unit(1, 0, 0)) == "A"
+
+    agent._semantic_cache_store("c", _unit(0, 0, 1), "C")
+
+    assert list(agent._SEMANTIC_CACHE) == ["a", "c"]
+    assert agent._semantic_cache_lookup(_unit(0, 1, 0)) is None
+
+
+@pytest.mark.asyncio
+async def test_run_agent_caches_in_context_and_skips_tool_calls(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    monkeypatch.setenv("HOLO_SEMCACHE", "1")
+    embedded: list[str] = []
+
+    def fake_embed(text: str) -> np.ndarray:
+        embedded.append(text)
+        return _unit(1, 0)
+
+    monkeypatch.setattr(agent, "_embed_query", fake_embed)
+
+    class _Sink:
+        async def speak(self, text: str) -> None:
+            pass
+
+    async def tool_completion(_messages: list[dict[str, str]]):
+        return '{"tool_calls":{"name":"done","arguments":{}}}'
+
+    messages = [
+        agent.build_message("system", "sys"),
+        agent.build_message("assistant", "Shall I dance?"),
+    ]
+    await agent.run_agent(
+        "yes", messages, completion_func=tool_completion, output_sink=_Sink()
+    )
+
+    assert embedded == ["Shall I dance?\nyes"]
+    assert not agent._SEMANTIC_CACHE